@@ -0,0 +1,126 @@
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import repeat
+
+
+class AhoCorasick[S: (str, bytes)]:
+    # the trie is turned into a full automaton: transitions[state * width + c]
+    # where c is the column of a symbol, column 0 is for symbols not in patterns
+    patterns: list[S]
+    columns: dict[str | int, int]
+    width: int
+    transitions: array[int]
+    terminals: array[int]
+    output_links: array[int]
+
+    def __init__(self, patterns: Iterable[S]):
+        self.patterns = list(dict.fromkeys(patterns))
+        if not all(self.patterns):
+            raise ValueError("patterns must not be empty")
+        symbols = sorted({c for pattern in self.patterns for c in pattern})
+        self.columns = {c: i for i, c in enumerate(symbols, 1)}
+        self.width = width = len(symbols) + 1
+        trie: list[dict[int, int]] = [{}]
+        terminals = [-1]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for c in pattern:
+                column = self.columns[c]
+                if column not in trie[state]:
+                    trie[state][column] = len(trie)
+                    trie.append({})
+                    terminals.append(-1)
+                state = trie[state][column]
+            terminals[state] = index
+        self.terminals = array("i", terminals)
+        # breadth-first search fills the failure function the same way as
+        # prefix_function does for a single pattern
+        self.transitions = transitions = array("i", [0]) * (len(trie) * width)
+        self.output_links = array("i", [-1]) * len(trie)
+        failure = [0] * len(trie)
+        queue = deque[int]()
+        for column, child in trie[0].items():
+            transitions[column] = child
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            link = failure[state]
+            if terminals[link] >= 0:
+                self.output_links[state] = link
+            else:
+                self.output_links[state] = self.output_links[link]
+            for column in range(width):
+                child = trie[state].get(column)
+                fallback = transitions[link * width + column]
+                if child is None:
+                    transitions[state * width + column] = fallback
+                else:
+                    failure[child] = fallback
+                    transitions[state * width + column] = child
+                    queue.append(child)
+
+    def iter_matches(self, chunks: Iterable[S]) -> Iterator[tuple[int, int]]:
+        # yields (offset, pattern index) for every occurrence of every pattern
+        transitions, width = self.transitions, self.width
+        terminals, output_links = self.terminals, self.output_links
+        lengths = [len(pattern) for pattern in self.patterns]
+        state = offset = 0
+        for chunk in chunks:
+            codes = map(self.columns.get, chunk, repeat(0))
+            for i, code in enumerate(codes, offset + 1):
+                state = transitions[state * width + code]
+                match = state if terminals[state] >= 0 else output_links[state]
+                while match > 0:
+                    index = terminals[match]
+                    yield i - lengths[index], index
+                    match = output_links[match]
+            offset += len(chunk)
+
+    def find_all(self, text: S) -> list[tuple[int, int]]:
+        return list(self.iter_matches([text]))
+
+
+def main() -> None:
+    from random import choice, randint
+    from string import ascii_lowercase
+    from time import monotonic as time_now
+    import re
+
+    text = "".join(choice(ascii_lowercase + " ") for _ in range(10**6))
+    for n in [10, 100, 1000, 5000]:
+        keywords = list(
+            {
+                "".join(choice(ascii_lowercase) for _ in range(randint(4, 8)))
+                for _ in range(n)
+            }
+        )
+        print(f"  {len(keywords)} keywords, {len(text)} characters")
+
+        t0 = time_now()
+        automaton = AhoCorasick(keywords)
+        t1 = time_now()
+        matches = automaton.find_all(text)
+        t2 = time_now()
+        print(f"dt={t1 - t0:.3f} + {t2 - t1:.3f} aho-corasick, {len(matches)} matches")
+
+        t0 = time_now()
+        count = 0
+        for keyword in keywords:
+            i = text.find(keyword)
+            while i != -1:
+                count += 1
+                i = text.find(keyword, i + 1)
+        t1 = time_now()
+        print(f"dt={t1 - t0:.3f} str.find, {count} matches")
+        assert count == len(matches)
+
+        t0 = time_now()
+        pattern = re.compile("|".join(map(re.escape, keywords)))
+        count = len(pattern.findall(text))
+        t1 = time_now()
+        print(f"dt={t1 - t0:.3f} re alternation, {count} non-overlapping matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import chain, product
+from math import inf
+from typing import Any, Self
+import json
+import mmap
+import struct
+
+MAGIC = b"DMAT"
+# magic, typecode, vertex count, length of the json encoded vertices
+HEADER = struct.Struct("<4sc3xQQ")
+TYPECODES = "fdi"
+# int32 matrices can not store inf, so the largest value stands for it
+INT_INFINITY = 2**31 - 1
+
+
+def _to_int(dist: float) -> int:
+    if dist == inf:
+        return INT_INFINITY
+    if dist != int(dist):
+        raise ValueError(f"{dist!r} can not be stored in an int matrix")
+    return int(dist)
+
+
+def _from_json(value: Any) -> Any:
+    # json turns tuples into lists, a list can not be a vertex since it's unhashable
+    if isinstance(value, list):
+        return tuple(map(_from_json, value))
+    return value
+
+
+class DistanceMatrix[T](Mapping[tuple[T, T], float]):
+    __slots__ = ("vertices", "indexes", "typecode", "data", "_mmap")
+
+    def __init__(
+        self,
+        vertices: Sequence[T],
+        data: array[Any] | memoryview,
+        mapped: mmap.mmap | None = None,
+    ):
+        typecode = data.format if isinstance(data, memoryview) else data.typecode
+        if typecode not in TYPECODES:
+            raise ValueError(f"typecode must be one of {TYPECODES!r}")
+        if len(data) != len(vertices) ** 2:
+            raise ValueError("data must contain len(vertices) ** 2 distances")
+        self.vertices = list(vertices)
+        self.indexes = {u: i for i, u in enumerate(self.vertices)}
+        self.typecode = typecode
+        self.data = data
+        self._mmap = mapped
+
+    @classmethod
+    def from_flat(
+        cls, vertices: Sequence[T], dists: Iterable[float], typecode: str = "f"
+    ) -> Self:
+        if typecode == "i":
+            dists = map(_to_int, dists)
+        return cls(vertices, array(typecode, dists))
+
+    @classmethod
+    def from_dict(
+        cls, dists: Mapping[tuple[T, T], float], typecode: str = "f"
+    ) -> Self:
+        vertices = list(dict.fromkeys(chain.from_iterable(dists)))
+        flat = (dists.get((u, v), inf) for u, v in product(vertices, repeat=2))
+        return cls.from_flat(vertices, flat, typecode)
+
+    def __getitem__(self, key: tuple[T, T]) -> float:
+        try:
+            u, v = key
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        dist = self.data[self.indexes[u] * len(self.vertices) + self.indexes[v]]
+        if self.typecode == "i" and dist == INT_INFINITY:
+            return inf
+        return dist
+
+    def __iter__(self) -> Iterator[tuple[T, T]]:
+        return product(self.vertices, repeat=2)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self.vertices}, {self.typecode!r})"
+
+    def row(self, u: T) -> memoryview:
+        # a view of the raw storage: in "i" matrices missing paths are
+        # INT_INFINITY here while __getitem__ turns them into inf
+        n = len(self.vertices)
+        i = self.indexes[u]
+        return memoryview(self.data)[i * n : (i + 1) * n]
+
+    def save(self, path: str) -> None:
+        vertices = json.dumps(self.vertices).encode()
+        # pad the vertices so the distances are aligned to 8 bytes
+        vertices += b" " * (-(HEADER.size + len(vertices)) % 8)
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC, self.typecode.encode(), len(self.vertices), len(vertices)
+                )
+            )
+            file.write(vertices)
+            file.write(self.data)
+
+    @staticmethod
+    def _data_view(mapped: mmap.mmap) -> memoryview:
+        _, typecode, n, vertices_size = HEADER.unpack_from(mapped)
+        offset = HEADER.size + vertices_size
+        end = offset + n * n * array(typecode.decode()).itemsize
+        return memoryview(mapped)[offset:end].cast(typecode.decode())
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = None
+        try:
+            magic, _, _, vertices_size = HEADER.unpack_from(mapped)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a distance matrix file")
+            raw = mapped[HEADER.size : HEADER.size + vertices_size]
+            vertices = _from_json(json.loads(raw))
+            data = cls._data_view(mapped)
+            return cls(vertices, data, mapped)
+        except BaseException:
+            if data is not None:
+                data.release()
+            mapped.close()
+            raise
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            if isinstance(self.data, memoryview):
+                self.data.release()
+            try:
+                self._mmap.close()
+            except BufferError:
+                # a row() view is still alive, the matrix stays open and usable
+                self.data = self._data_view(self._mmap)
+                raise
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def main() -> None:
+    from os import path
+    from random import randint
+    from sys import getsizeof
+    from tempfile import TemporaryDirectory
+    from time import monotonic as time_now
+
+    from roy_floyd_warshall import roy_floyd_warshall_intkeys_flat
+
+    n = 200
+    graph: dict[int, dict[int, float]] = {
+        u: {v: randint(1, n**2) for v in range(n) if randint(1, n) >= n**0.5}
+        for u in range(n)
+    }
+    flat = roy_floyd_warshall_intkeys_flat(graph)
+    dists = {(u, v): flat[u * n + v] for u in range(n) for v in range(n)}
+    size = getsizeof(dists) + sum(getsizeof(k) + getsizeof(d) for k, d in dists.items())
+    print(f"{size:>10} bytes in dict[tuple[int, int], float]")
+    for typecode in TYPECODES:
+        matrix = DistanceMatrix.from_flat(range(n), flat, typecode)
+        assert all(matrix[key] == dist for key, dist in dists.items())
+        print(f"{getsizeof(matrix.data):>10} bytes in DistanceMatrix({typecode!r})")
+        with TemporaryDirectory() as directory:
+            filename = path.join(directory, "dists.bin")
+            t0 = time_now()
+            matrix.save(filename)
+            t1 = time_now()
+            with DistanceMatrix.load(filename) as loaded:
+                t2 = time_now()
+                assert loaded == matrix
+            print(f"save: {t1 - t0:.3f} load: {t2 - t1:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from array import array
+from collections.abc import Iterable, Iterator
+import random
+import struct
+
+MAGIC = b"MAZE"
+# magic, width, height, then the rows from y = 0, one byte per cell
+HEADER = struct.Struct("<4s4xQQ")
+
+
+def generate_rows(w: int, h: int) -> Iterator[bytes]:
+    # Eller's algorithm: only the sets of the current row are kept, the rows use
+    # the same 1/2/4/8 walls as kruskal_maze.generate and go from y = 0 upwards
+    if w <= 0 or h <= 0:
+        return
+    labels = array("i", range(w))
+    south = b"\x08" * w
+    for y in range(h):
+        last_row = y == h - 1
+        # labels are below w, so the sets of a row fit in one small forest
+        parents = array("i", range(w))
+        row = bytearray(w)
+        east_bits = random.getrandbits(w)
+        for x in range(w - 1):
+            a, b = labels[x], labels[x + 1]
+            while parents[a] != a:
+                parents[a] = parents[parents[a]]
+                a = parents[a]
+            while parents[b] != b:
+                parents[b] = parents[parents[b]]
+                b = parents[b]
+            if a != b and (last_row or east_bits >> x & 1):
+                parents[b] = a
+            else:
+                row[x] |= 1
+                row[x + 1] |= 4
+        row[0] |= 4
+        row[w - 1] |= 1
+        roots = array("i", labels)
+        for x, a in enumerate(roots):
+            while parents[a] != a:
+                parents[a] = parents[parents[a]]
+                a = parents[a]
+            roots[x] = a
+        # every set keeps at least one passage to the next row, forced at the
+        # last cell of the set if the coin flips gave none
+        last = array("i", [0]) * w
+        for x, a in enumerate(roots):
+            last[a] = x
+        opened = bytearray(w)
+        north_bits = 0 if last_row else random.getrandbits(w)
+        next_labels = array("i", [-1]) * w
+        compact = array("i", [-1]) * w
+        size = 0
+        for x, a in enumerate(roots):
+            if not last_row and (north_bits >> x & 1 or last[a] == x and not opened[a]):
+                opened[a] = 1
+                if compact[a] < 0:
+                    compact[a] = size
+                    size += 1
+                next_labels[x] = compact[a]
+            else:
+                row[x] |= 2
+            row[x] |= south[x]
+        for x in range(w):
+            if next_labels[x] < 0:
+                next_labels[x] = size
+                size += 1
+        labels = next_labels
+        south = bytes(8 * (c >> 1 & 1) for c in row)
+        yield bytes(row)
+
+
+def write_maze(path: str, w: int, h: int, rows: Iterable[bytes] | None = None) -> None:
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, w, h))
+        for row in generate_rows(w, h) if rows is None else rows:
+            file.write(row)
+
+
+def read_maze(path: str) -> tuple[int, int, bytes]:
+    with open(path, "rb") as file:
+        magic, w, h = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a maze file")
+        return w, h, file.read(w * h)
+
+
+def main() -> None:
+    from os import path
+    from sys import argv
+    from tempfile import TemporaryDirectory
+    from time import monotonic as time_now
+    import tracemalloc
+
+    from kruskal_maze import render
+
+    w, h = 10, 10
+    print(render(b"".join(generate_rows(w, h)), w, h))
+
+    sizes = list(map(int, argv[1:])) or [100, 300, 1000, 2000]
+    with TemporaryDirectory() as directory:
+        filename = path.join(directory, "maze.bin")
+        for size in sizes:
+            t0 = time_now()
+            write_maze(filename, size, size)
+            t1 = time_now()
+            tracemalloc.start()
+            for _ in generate_rows(size, size):
+                pass
+            peak = tracemalloc.get_traced_memory()[1] / 2**10
+            tracemalloc.stop()
+            print(f"{size} x {size}: dt={t1 - t0:.3f} peak={peak:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,17 @@
+from array import array
+from collections.abc import Iterator
+from functools import partial
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from random import randint
+from time import perf_counter
+import cmath
 import itertools
+import json
+import math
+import os
+import sys
 
 
 def add(u: list[int], v: list[int]) -> list[int]:
@@ -22,19 +35,184 @@ def karatsuba(u: list[int], v: list[int]) -> list[int]:
     return w0[:split_size] + w1[:split_size] + add(w2, w1[split_size:])
 
 
-def karatsuba_v2(u: list[int], v: list[int]) -> list[int]:
-    if len(u) <= 16 or len(v) <= 16:
+# the crossover to simple_multiply differs a lot between CPython and PyPy,
+# run `python karatsuba.py calibrate` to measure it on the host
+KARATSUBA_CONFIG = Path(
+    os.environ.get("KARATSUBA_CONFIG", Path.home() / ".config" / "karatsuba.json")
+)
+KARATSUBA_CANDIDATE_THRESHOLDS = [4, 8, 12, 16, 24, 32, 48, 64, 96, 128]
+
+
+def _interpreter() -> str:
+    return f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def load_karatsuba_threshold(default: int = 16) -> int:
+    # a broken config must not break the import, so anything odd means the default
+    try:
+        config = json.loads(KARATSUBA_CONFIG.read_text())
+        threshold = int(config.get(_interpreter(), default))
+    except (OSError, ValueError, TypeError, AttributeError, OverflowError):
+        return default
+    return threshold if threshold >= 1 else default
+
+
+def calibrate_karatsuba_threshold(size: int = 2**10, repeat: int = 3) -> int:
+    u, v = ([randint(1, 255) for _ in range(size)] for _ in range(2))
+    timings = {}
+    for threshold in KARATSUBA_CANDIDATE_THRESHOLDS:
+        runs = []
+        for _ in range(repeat):
+            t0 = perf_counter()
+            karatsuba_v2(u, v, threshold)
+            runs.append(perf_counter() - t0)
+        timings[threshold] = min(runs)
+    return min(timings, key=timings.__getitem__)
+
+
+def save_karatsuba_threshold(threshold: int) -> None:
+    try:
+        config = json.loads(KARATSUBA_CONFIG.read_text())
+    except (OSError, ValueError):
+        config = {}
+    config[_interpreter()] = threshold
+    KARATSUBA_CONFIG.parent.mkdir(parents=True, exist_ok=True)
+    KARATSUBA_CONFIG.write_text(json.dumps(config, indent=4) + "\n")
+
+
+KARATSUBA_THRESHOLD = load_karatsuba_threshold()
+
+
+def _karatsuba_threshold(threshold: int | None) -> int:
+    if threshold is None:
+        return KARATSUBA_THRESHOLD
+    if threshold < 1:
+        raise ValueError("threshold must be at least 1")
+    return threshold
+
+
+def karatsuba_v2(
+    u: list[int], v: list[int], threshold: int | None = None
+) -> list[int]:
+    threshold = _karatsuba_threshold(threshold)
+    if len(u) <= threshold or len(v) <= threshold:
         return simple_multiply(u, v)
     split_size = min(len(u), len(v)) // 2
     u_low, u_high = u[:split_size], u[split_size:]
     v_low, v_high = v[:split_size], v[split_size:]
-    w2 = karatsuba_v2(u_high, v_high)
-    w1 = karatsuba_v2(add(u_low, u_high), add(v_low, v_high))
-    w0 = karatsuba_v2(u_low, v_low)
+    w2 = karatsuba_v2(u_high, v_high, threshold)
+    w1 = karatsuba_v2(add(u_low, u_high), add(v_low, v_high), threshold)
+    w0 = karatsuba_v2(u_low, v_low, threshold)
     w1 = add(substract(substract(w1, w0), w2), w0[split_size:])
     return w0[:split_size] + w1[:split_size] + add(w2, w1[split_size:])
 
 
+PARALLEL_THRESHOLD = 2**16
+
+# an operand of a subproblem is the sum of segments (offset, length) of an input
+type Segments = list[tuple[int, int]]
+
+
+def _split(segments: Segments, split_size: int) -> tuple[Segments, Segments]:
+    low = [(offset, min(length, split_size)) for offset, length in segments]
+    high = [
+        (offset + split_size, length - split_size)
+        for offset, length in segments
+        if length > split_size
+    ]
+    return low, high
+
+
+def _length(segments: Segments) -> int:
+    return max(length for _, length in segments)
+
+
+def _subproblems(
+    us: Segments, vs: Segments, levels: int, threshold: int
+) -> Iterator[tuple[Segments, Segments]]:
+    # must stop where karatsuba_v2 with the same threshold stops
+    if levels == 0 or _length(us) <= threshold or _length(vs) <= threshold:
+        yield us, vs
+        return
+    split_size = min(_length(us), _length(vs)) // 2
+    u_low, u_high = _split(us, split_size)
+    v_low, v_high = _split(vs, split_size)
+    yield from _subproblems(u_high, v_high, levels - 1, threshold)
+    yield from _subproblems(u_low + u_high, v_low + v_high, levels - 1, threshold)
+    yield from _subproblems(u_low, v_low, levels - 1, threshold)
+
+
+def _combine(
+    us: Segments,
+    vs: Segments,
+    levels: int,
+    products: Iterator[list[int]],
+    threshold: int,
+) -> list[int]:
+    if levels == 0 or _length(us) <= threshold or _length(vs) <= threshold:
+        return next(products)
+    split_size = min(_length(us), _length(vs)) // 2
+    u_low, u_high = _split(us, split_size)
+    v_low, v_high = _split(vs, split_size)
+    w2 = _combine(u_high, v_high, levels - 1, products, threshold)
+    w1 = _combine(u_low + u_high, v_low + v_high, levels - 1, products, threshold)
+    w0 = _combine(u_low, v_low, levels - 1, products, threshold)
+    w1 = add(substract(substract(w1, w0), w2), w0[split_size:])
+    return w0[:split_size] + w1[:split_size] + add(w2, w1[split_size:])
+
+
+_shared_memory: list[SharedMemory] = []
+_shared_inputs: list[memoryview] = []
+
+
+def _init_karatsuba_worker(u_name: str, v_name: str) -> None:
+    for name in (u_name, v_name):
+        _shared_memory.append(SharedMemory(name))
+        _shared_inputs.append(_shared_memory[-1].buf.cast("q"))
+
+
+def _karatsuba_subproblem(
+    task: tuple[Segments, Segments], threshold: int
+) -> list[int]:
+    u: list[int] = []
+    v: list[int] = []
+    for buffer, operand, segments in zip(_shared_inputs, (u, v), task):
+        for offset, length in segments:
+            operand[:] = add(operand, buffer[offset : offset + length].tolist())
+    return karatsuba_v2(u, v, threshold)
+
+
+def karatsuba_parallel(
+    u: list[int],
+    v: list[int],
+    levels: int = 1,
+    processes: int | None = None,
+    threshold: int = PARALLEL_THRESHOLD,
+    karatsuba_threshold: int | None = None,
+) -> list[int]:
+    # the top levels of the recursion give 3^levels independent subproblems
+    karatsuba_threshold = _karatsuba_threshold(karatsuba_threshold)
+    if min(len(u), len(v)) < max(threshold, karatsuba_threshold + 1):
+        return karatsuba_v2(u, v, karatsuba_threshold)
+    shared = [SharedMemory(create=True, size=8 * len(x)) for x in (u, v)]
+    try:
+        for shm, x in zip(shared, (u, v)):
+            # the segment may be rounded up to a whole page, as on macOS
+            shm.buf[: 8 * len(x)] = array("q", x).tobytes()
+        us, vs = [(0, len(u))], [(0, len(v))]
+        names = tuple(shm.name for shm in shared)
+        with Pool(processes, _init_karatsuba_worker, names) as pool:
+            products = pool.map(
+                partial(_karatsuba_subproblem, threshold=karatsuba_threshold),
+                _subproblems(us, vs, levels, karatsuba_threshold),
+            )
+        return _combine(us, vs, levels, iter(products), karatsuba_threshold)
+    finally:
+        for shm in shared:
+            shm.close()
+            shm.unlink()
+
+
 def simple_multiply(u: list[int], v: list[int]) -> list[int]:
     w = [0] * (len(u) + len(v) - 1)
     for i, x in enumerate(u):
@@ -43,9 +221,310 @@ def simple_multiply(u: list[int], v: list[int]) -> list[int]:
     return w
 
 
-if __name__ == "__main__":
+def karatsuba_scratch_size(n: int, threshold: int | None = None) -> int:
+    threshold = _karatsuba_threshold(threshold)
+    size = 0
+    while n > threshold:
+        n -= n // 2
+        size += 4 * n - 1
+    return size
+
+
+def _karatsuba_into(
+    a: array[int],
+    ai: int,
+    b: array[int],
+    bi: int,
+    n: int,
+    out: array[int],
+    oi: int,
+    scratch: array[int],
+    si: int,
+    threshold: int,
+) -> None:
+    # out[oi : oi + 2n - 1] = a[ai : ai + n] * b[bi : bi + n]
+    if n <= threshold:
+        for k in range(oi, oi + 2 * n - 1):
+            out[k] = 0
+        for i in range(n):
+            x = a[ai + i]
+            if x:
+                k = oi + i - bi
+                for j in range(bi, bi + n):
+                    out[k + j] += x * b[j]
+        return
+    h = n // 2
+    m = n - h
+    _karatsuba_into(a, ai, b, bi, h, out, oi, scratch, si, threshold)
+    out[oi + 2 * h - 1] = 0
+    _karatsuba_into(a, ai + h, b, bi + h, m, out, oi + 2 * h, scratch, si, threshold)
+    # scratch holds a_low + a_high, b_low + b_high, their product and then
+    # the scratch space of the next level
+    sa, sb, w1, rest = si, si + m, si + 2 * m, si + 4 * m - 1
+    for i in range(h):
+        scratch[sa + i] = a[ai + i] + a[ai + h + i]
+        scratch[sb + i] = b[bi + i] + b[bi + h + i]
+    if m > h:
+        scratch[sa + h] = a[ai + 2 * h]
+        scratch[sb + h] = b[bi + 2 * h]
+    _karatsuba_into(scratch, sa, scratch, sb, m, scratch, w1, scratch, rest, threshold)
+    for i in range(2 * h - 1):
+        scratch[w1 + i] -= out[oi + i]
+    for i in range(2 * m - 1):
+        scratch[w1 + i] -= out[oi + 2 * h + i]
+    for i in range(2 * m - 1):
+        out[oi + h + i] += scratch[w1 + i]
+
+
+def karatsuba_inplace(
+    u: list[int], v: list[int], threshold: int | None = None
+) -> list[int]:
+    if not u or not v:
+        return []
+    threshold = _karatsuba_threshold(threshold)
+    n = max(len(u), len(v))
+    a = array("q", u) + array("q", [0]) * (n - len(u))
+    b = array("q", v) + array("q", [0]) * (n - len(v))
+    out = array("q", [0]) * (2 * n - 1)
+    scratch = array("q", [0]) * karatsuba_scratch_size(n, threshold)
+    _karatsuba_into(a, 0, b, 0, n, out, 0, scratch, 0, threshold)
+    return out[: len(u) + len(v) - 1].tolist()
+
+
+# primes p = c * 2^k + 1 with a primitive root g, product is above 10^54;
+# sizes above 2^21 skip 1004535809 (k = 21) and use the other five primes
+NTT_PRIMES = [
+    (998244353, 3),
+    (167772161, 3),
+    (469762049, 3),
+    (754974721, 11),
+    (1004535809, 3),
+    (2013265921, 31),
+]
+NTT_MAX_SIZE = 2**23
+KARATSUBA_TO_NTT_THRESHOLD = 2**9
+
+
+def bit_reversal(n: int) -> list[int]:
+    rev = [0] * n
+    for i in range(1, n):
+        rev[i] = (rev[i >> 1] >> 1) | (i & 1) * (n >> 1)
+    return rev
+
+
+def ntt(a: list[int], p: int, g: int, invert: bool = False) -> list[int]:
+    n = len(a)
+    a = [a[i] for i in bit_reversal(n)]
+    length = 2
+    while length <= n:
+        half = length // 2
+        w = pow(g, (p - 1) // length * (-1 if invert else 1), p)
+        ws = list(itertools.accumulate([1] * half, lambda x, _: x * w % p))
+        # butterflies with the same twiddle are done together with slices
+        if half < n // length:
+            for k, w in enumerate(ws):
+                lo = a[k::length]
+                hi = [y * w % p for y in a[k + half :: length]]
+                a[k::length] = [(x + y) % p for x, y in zip(lo, hi)]
+                a[k + half :: length] = [(x - y) % p for x, y in zip(lo, hi)]
+        else:
+            for i in range(0, n, length):
+                lo = a[i : i + half]
+                hi = [y * w % p for y, w in zip(a[i + half : i + length], ws)]
+                a[i : i + half] = [(x + y) % p for x, y in zip(lo, hi)]
+                a[i + half : i + length] = [(x - y) % p for x, y in zip(lo, hi)]
+        length *= 2
+    if invert:
+        n_inv = pow(n, -1, p)
+        a = [x * n_inv % p for x in a]
+    return a
+
+
+def ntt_multiply_modulo(u: list[int], v: list[int], p: int, g: int) -> list[int]:
+    size = len(u) + len(v) - 1
+    n = 1 << (size - 1).bit_length()
+    fu = ntt([x % p for x in u] + [0] * (n - len(u)), p, g)
+    fv = ntt([x % p for x in v] + [0] * (n - len(v)), p, g)
+    return ntt([x * y % p for x, y in zip(fu, fv)], p, g, invert=True)[:size]
+
+
+def coefficient_bound(u: list[int], v: list[int]) -> int:
+    # every coefficient of the product lies in (-bound, bound)
+    return max(map(abs, u)) * max(map(abs, v)) * min(len(u), len(v)) + 1
+
+
+def ntt_modulus(size: int) -> int:
+    # product of the primes which have roots of unity for a transform of that size
+    n = 1 << (size - 1).bit_length()
+    return math.prod(p for p, _ in NTT_PRIMES if (p - 1) % n == 0)
+
+
+def ntt_multiply(u: list[int], v: list[int]) -> list[int]:
+    if not u or not v:
+        return []
+    if len(u) + len(v) - 1 > NTT_MAX_SIZE:
+        raise ValueError(f"ntt_multiply supports at most {NTT_MAX_SIZE} coefficients")
+    bound = coefficient_bound(u, v)
+    n = 1 << (len(u) + len(v) - 2).bit_length()
+    w: list[int] = []
+    modulus = 1
+    for p, g in NTT_PRIMES:
+        if (p - 1) % n:
+            continue
+        residues = ntt_multiply_modulo(u, v, p, g)
+        if not w:
+            w = residues
+        else:
+            # Garner's step of the chinese remainder theorem
+            m_inv = pow(modulus, -1, p)
+            w = [x + (r - x) * m_inv % p * modulus for x, r in zip(w, residues)]
+        modulus *= p
+        if modulus > 2 * bound:
+            return [x - modulus if x > modulus // 2 else x for x in w]
+    raise ValueError("coefficients are too large for ntt_multiply")
+
+
+def fft(a: list[complex], invert: bool = False) -> list[complex]:
+    n = len(a)
+    a = [a[i] for i in bit_reversal(n)]
+    length = 2
+    while length <= n:
+        half = length // 2
+        angle = (1 if invert else -1) * 2 * cmath.pi / length
+        ws = [cmath.exp(1j * angle * k) for k in range(half)]
+        for i in range(0, n, length):
+            lo = a[i : i + half]
+            hi = [y * w for y, w in zip(a[i + half : i + length], ws)]
+            a[i : i + half] = [x + y for x, y in zip(lo, hi)]
+            a[i + half : i + length] = [x - y for x, y in zip(lo, hi)]
+        length *= 2
+    if invert:
+        a = [x / n for x in a]
+    return a
+
+
+def fft_multiply(u: list[int], v: list[int]) -> list[int]:
+    # exact only while the coefficients of the product stay well below 2^50
+    if not u or not v:
+        return []
+    size = len(u) + len(v) - 1
+    n = 1 << (size - 1).bit_length()
+    fu = fft([complex(x) for x in u] + [0j] * (n - len(u)))
+    fv = fft([complex(x) for x in v] + [0j] * (n - len(v)))
+    w = fft([x * y for x, y in zip(fu, fv)], invert=True)
+    return [round(x.real) for x in w[:size]]
+
+
+def multiply(u: list[int], v: list[int]) -> list[int]:
+    if min(len(u), len(v)) <= KARATSUBA_THRESHOLD:
+        return simple_multiply(u, v)
+    if min(len(u), len(v)) < KARATSUBA_TO_NTT_THRESHOLD:
+        return karatsuba_v2(u, v)
+    size = len(u) + len(v) - 1
+    if size <= NTT_MAX_SIZE and 2 * coefficient_bound(u, v) < ntt_modulus(size):
+        return ntt_multiply(u, v)
+    return karatsuba_v2(u, v)
+
+
+LIMB_BITS = 16
+
+
+def int_to_limbs(x: int) -> list[int]:
+    # little-endian base 2^16 digits of a non-negative integer
+    data = x.to_bytes((x.bit_length() + 15) // 16 * 2, "little")
+    limbs = array("H", data)
+    if sys.byteorder == "big":
+        limbs.byteswap()
+    return limbs.tolist()
+
+
+def limbs_to_int(limbs: list[int]) -> int:
+    # limbs may be unnormalized (up to 2^64), the carries are propagated by
+    # splitting every limb into 16-bit parts and adding four shifted integers
+    result = 0
+    mask = (1 << LIMB_BITS) - 1
+    for shift in range(0, 64, LIMB_BITS):
+        part = array("H", [x >> shift & mask for x in limbs])
+        if not any(part):
+            continue
+        if sys.byteorder == "big":
+            part.byteswap()
+        result += int.from_bytes(part.tobytes(), "little") << shift
+    return result
+
+
+def propagate_carries(limbs: list[int]) -> list[int]:
+    return int_to_limbs(limbs_to_int(limbs))
+
+
+def multiply_ints(x: int, y: int) -> int:
+    sign = -1 if (x < 0) != (y < 0) else 1
+    u, v = int_to_limbs(abs(x)), int_to_limbs(abs(y))
+    return sign * limbs_to_int(multiply(u, v))
+
+
+if __name__ == "__main__" and sys.argv[1:] == ["calibrate"]:
+    KARATSUBA_THRESHOLD = calibrate_karatsuba_threshold()
+    save_karatsuba_threshold(KARATSUBA_THRESHOLD)
+    print(f"{_interpreter()}: {KARATSUBA_THRESHOLD=} saved to {KARATSUBA_CONFIG}")
+elif __name__ == "__main__":
     from time import monotonic as time
-    from random import randint
+
+    print(" power : karatsuba_v2  karatsuba_inplace  speedup")
+    for n in range(15):
+        u, v = ([randint(1, 255) for _ in range(2**n)] for _ in range(2))
+        t0 = time()
+        w1 = karatsuba_v2(u, v)
+        t1 = time()
+        w2 = karatsuba_inplace(u, v)
+        t2 = time()
+        speedup = (t1 - t0) / (t2 - t1)
+        print(f"  {n:3}  : {t1 - t0:0.7f} vs {t2 - t1:0.7f}  {speedup:0.2f}")
+        assert w1 == w2
+
+    print(" power : karatsuba_v2  karatsuba_parallel")
+    for n in range(12, 17):
+        u, v = ([randint(1, 255) for _ in range(2**n)] for _ in range(2))
+        t0 = time()
+        w1 = karatsuba_v2(u, v)
+        t1 = time()
+        w2 = karatsuba_parallel(u, v, levels=2, threshold=0)
+        t2 = time()
+        print(f"  {n:3}  : {t1 - t0:0.7f} vs {t2 - t1:0.7f}")
+        assert w1 == w2
+
+    from math import log2
+    from random import getrandbits
+
+    sys.set_int_max_str_digits(0)
+    print(" digits : int.__mul__  multiply_ints")
+    for digits in [10**5, 10**6, 10**7]:
+        x, y = (getrandbits(int(digits * log2(10))) for _ in range(2))
+        t0 = time()
+        z1 = x * y
+        t1 = time()
+        z2 = multiply_ints(x, y)
+        t2 = time()
+        print(f" {digits:>8} : {t1 - t0:0.7f} vs {t2 - t1:0.7f}")
+        assert z1 == z2
+
+    print(" power : karatsuba_v2  ntt_multiply  fft_multiply  multiply")
+    for n in range(19):
+        u, v = ([randint(1, 255) for _ in range(2**n)] for _ in range(2))
+        t0 = time()
+        w1 = karatsuba_v2(u, v)
+        t1 = time()
+        w2 = ntt_multiply(u, v)
+        t2 = time()
+        w3 = fft_multiply(u, v)
+        t3 = time()
+        w4 = multiply(u, v)
+        t4 = time()
+        print(
+            f"  {n:3}  : {t1 - t0:0.7f} vs {t2 - t1:0.7f} vs {t3 - t2:0.7f}"
+            f" vs {t4 - t3:0.7f}"
+        )
+        assert w1 == w2 == w3 == w4
 
     print(" power : karatsuba  karatsuba_v2  simple_multiplication")
     for n in range(100):
@@ -81,3 +560,52 @@ if __name__ == "__main__":
    17  : 274.00968 vs 48.865228 vs 1993.0935
    18  : 801.75741 vs 149.10361 vs 9168.3369
 """
+"""
+ power : karatsuba_v2  ntt_multiply  fft_multiply  multiply
+    0  : 0.0000065 vs 0.0000245 vs 0.0000158 vs 0.0000044
+    1  : 0.0000042 vs 0.0000891 vs 0.0000634 vs 0.0000043
+    2  : 0.0000051 vs 0.0001011 vs 0.0000767 vs 0.0000046
+    3  : 0.0000098 vs 0.0001502 vs 0.0001343 vs 0.0000113
+    4  : 0.0000308 vs 0.0002720 vs 0.0002543 vs 0.0000338
+    5  : 0.0001173 vs 0.0004637 vs 0.0005332 vs 0.0001095
+    6  : 0.0003431 vs 0.0008443 vs 0.0023779 vs 0.0003592
+    7  : 0.0010547 vs 0.0016738 vs 0.0019989 vs 0.0010403
+    8  : 0.0032055 vs 0.0031283 vs 0.0045446 vs 0.0033317
+    9  : 0.0098735 vs 0.0067260 vs 0.0097384 vs 0.0069290
+   10  : 0.0291985 vs 0.0148357 vs 0.0202683 vs 0.0144066
+   11  : 0.0896643 vs 0.0290238 vs 0.0290131 vs 0.0191125
+   12  : 0.2625462 vs 0.0433469 vs 0.0493243 vs 0.0397797
+   13  : 0.5790934 vs 0.2426713 vs 0.1062474 vs 0.1711389
+   14  : 1.6204921 vs 0.3711901 vs 0.2258339 vs 0.3918475
+   15  : 4.5818544 vs 0.8680850 vs 0.4971421 vs 0.9185009
+   16  : 14.1751148 vs 1.8274389 vs 1.4739962 vs 2.1658532
+   17  : 58.8770841 vs 6.1911833 vs 3.8207022 vs 6.1146716
+   18  : 179.1757588 vs 10.4025389 vs 6.5360938 vs 14.2327305
+"""
+"""
+ power : karatsuba_v2  karatsuba_inplace  speedup
+    0  : 0.0000074 vs 0.0000185  0.40
+    1  : 0.0000065 vs 0.0000144  0.45
+    2  : 0.0000052 vs 0.0000141  0.37
+    3  : 0.0000098 vs 0.0000269  0.36
+    4  : 0.0000321 vs 0.0000982  0.33
+    5  : 0.0001312 vs 0.0002363  0.56
+    6  : 0.0003613 vs 0.0007334  0.49
+    7  : 0.0011223 vs 0.0022979  0.49
+    8  : 0.0034420 vs 0.0075727  0.45
+    9  : 0.0104684 vs 0.0234397  0.45
+   10  : 0.0312211 vs 0.0717112  0.44
+   11  : 0.0942968 vs 0.2393364  0.39
+   12  : 0.2923499 vs 0.6896377  0.42
+   13  : 0.8499612 vs 2.0424418  0.42
+   14  : 1.9010311 vs 3.7607469  0.51
+CPython pays more for indexing array('q') element by element than for
+the lists that karatsuba_v2 allocates, so karatsuba_inplace is only
+worth it under a JIT like PyPy.
+"""
+"""
+ digits : int.__mul__  multiply_ints
+   100000 : 0.0205668 vs 0.8929910
+  1000000 : 0.4653281 vs 10.5575975
+ 10000000 : 21.1609224 vs 136.2210359
+"""
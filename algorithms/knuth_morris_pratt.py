@@ -1,7 +1,17 @@
+from array import array
+from collections.abc import Iterable, Iterator
+from functools import partial
+from mmap import ACCESS_READ, mmap
+from socket import socket
+from typing import IO
+import sys
+
+type Buffer = bytes | bytearray | memoryview | mmap
+
 number_of_iterations = 0
 
 
-def prefix_function(s: str) -> list[int]:
+def prefix_function(s: str | Buffer) -> list[int]:
     dp = [0] * len(s)
     for i in range(1, len(s)):
         j = dp[i - 1]
@@ -20,7 +30,162 @@ def find(haystack: str, needle: str, default: None = None) -> int | None:
     return default
 
 
-while True:
-    s1 = input("haystack: ")
-    s2 = input("  needle: ")
-    print(find(s1, s2))
+def iter_matches[S: (str, bytes)](chunks: Iterable[S], needle: S) -> Iterator[int]:
+    # only the needle and its failure table are kept, the haystack is streamed
+    if not needle:
+        raise ValueError("needle must not be empty")
+    failure = prefix_function(needle)
+    j = offset = 0
+    for chunk in chunks:
+        for i, c in enumerate(chunk):
+            while j and needle[j] != c:
+                j = failure[j - 1]
+            if needle[j] == c:
+                j += 1
+            if j == len(needle):
+                yield offset + i + 1 - j
+                j = failure[j - 1]
+        offset += len(chunk)
+
+
+def read_chunks[S: (str, bytes)](file: IO[S], chunk_size: int = 2**16) -> Iterator[S]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+def find_in_file[S: (str, bytes)](
+    path: str, needle: S, chunk_size: int = 2**16, encoding: str = "utf-8"
+) -> Iterator[int]:
+    # offsets are in characters for str needles and in bytes for bytes needles,
+    # line endings are kept as they are so that "\r\n" counts as two characters
+    if isinstance(needle, bytes):
+        file = open(path, "rb")
+    else:
+        file = open(path, encoding=encoding, newline="")
+    with file:
+        yield from iter_matches(read_chunks(file, chunk_size), needle)
+
+
+def find_in_socket(
+    connection: socket, needle: bytes, chunk_size: int = 2**16
+) -> Iterator[int]:
+    yield from iter_matches(iter(partial(connection.recv, chunk_size), b""), needle)
+
+
+def iter_byte_matches(haystack: Buffer, needle: Buffer) -> Iterator[int]:
+    # iterating a memoryview reads the bytes in place, only the needle is copied
+    with memoryview(haystack) as view, view.cast("B") as data:
+        yield from iter_matches([data], bytes(needle))  # type: ignore
+
+
+def find_bytes(
+    haystack: Buffer, needle: Buffer, default: None = None
+) -> int | None:
+    return next(iter_byte_matches(haystack, needle), default)
+
+
+def find_in_mapped_file(path: str, needle: Buffer) -> Iterator[int]:
+    with open(path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+        yield from iter_byte_matches(data, needle)
+
+
+def kmp_automaton[S: (str, bytes)](
+    needle: S,
+) -> tuple[dict[str | int, int], int, array[int]]:
+    # transitions[j * width + c] is the row offset of the state after reading
+    # a symbol of column c in state j, column 0 is for symbols not in the needle
+    if not needle:
+        raise ValueError("needle must not be empty")
+    failure = prefix_function(needle)
+    columns = {c: i for i, c in enumerate(sorted(set(needle)), 1)}
+    width = len(columns) + 1
+    m = len(needle)
+    transitions = array("q", [0]) * ((m + 1) * width)
+    for j in range(m + 1):
+        row = j * width
+        if j:
+            fallback = failure[j - 1] * width
+            transitions[row : row + width] = transitions[fallback : fallback + width]
+        if j < m:
+            transitions[row + columns[needle[j]]] = row + width
+    return columns, width, transitions
+
+
+def find_all[S: (str, bytes)](haystack: S, needle: S) -> list[int]:
+    # in the initial state the automaton waits for the first symbol of the
+    # needle, so that stretch is skipped by the find method which runs in C
+    columns, width, transitions = kmp_automaton(needle)
+    m, n = len(needle), len(haystack)
+    target = m * width
+    first = needle[:1]
+    result = []
+    row = i = 0
+    while i < n:
+        if not row:
+            i = haystack.find(first, i)
+            if i == -1:
+                break
+        row = transitions[row + columns.get(haystack[i], 0)]
+        i += 1
+        if row == target:
+            result.append(i - m)
+    return result
+
+
+def interactive() -> None:
+    while True:
+        s1 = input("haystack: ")
+        s2 = input("  needle: ")
+        print(find(s1, s2))
+
+
+def main() -> None:
+    from itertools import product
+    from random import choice, randint
+    from string import ascii_lowercase
+    from time import monotonic as time_now
+    import re
+
+    def str_find_all(haystack: str, needle: str) -> list[int]:
+        result, i = [], haystack.find(needle)
+        while i != -1:
+            result.append(i)
+            i = haystack.find(needle, i + 1)
+        return result
+
+    def re_find_all(haystack: str, needle: str) -> list[int]:
+        # a lookahead is needed to report overlapping matches
+        pattern = re.compile(f"(?={re.escape(needle)})")
+        return [match.start() for match in pattern.finditer(haystack)]
+
+    def streaming(haystack: str, needle: str) -> list[int]:
+        chunks = (haystack[i : i + 2**16] for i in range(0, len(haystack), 2**16))
+        return list(iter_matches(chunks, needle))
+
+    methods = {
+        "find_all": find_all,
+        "iter_matches": streaming,
+        "str.find": str_find_all,
+        "re": re_find_all,
+    }
+    for alphabet, n in product(["acgt", ascii_lowercase], [10**4, 10**5, 10**6]):
+        text = "".join(choice(alphabet) for _ in range(n))
+        for m in [4, 16, 64]:
+            i = randint(0, n - m)
+            needle = text[i : i + m]
+            print(f"  {len(alphabet)} symbols, n = {n}, m = {m}")
+            expected = None
+            for name, method in methods.items():
+                t0 = time_now()
+                result = method(text, needle)
+                t1 = time_now()
+                assert expected is None or result == expected
+                expected = result
+                print(f"dt={t1 - t0:.4f} {name}, {len(result)} matches")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["interactive"]:
+        interactive()
+    else:
+        main()
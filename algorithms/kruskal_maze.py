@@ -1,4 +1,5 @@
-from collections.abc import Iterable
+from array import array
+from collections.abc import Iterable, Sequence
 import random
 import dataclasses
 
@@ -58,10 +59,168 @@ def generate(w: int, h: int, obstatcles: Iterable[Obstacle] = ()) -> list[int]:
     return maze
 
 
-w, h = 10, 10
-maze = generate(w, h, [Obstacle(0, 0, 2, 2), Obstacle(3, 3, 10, 6)])
-for y in reversed(range(h)):
-    row: list[str] = []
-    for x in range(w):
-        row.append("╬╣╦╗╠║╔╥╩╝═╡╚╨╞?"[maze[x + y * w]])
-    print("".join(row))
+def generate_packed(w: int, h: int, obstacles: Iterable[Obstacle] = ()) -> bytearray:
+    # same encoding as generate, one byte per cell; wall k is the east (k & 1 == 0)
+    # or the north (k & 1 == 1) wall of the cell k >> 1
+    n = w * h
+    active_cells = bytearray(b"\1") * n
+    for obstacle in obstacles:
+        x1, x2 = max(obstacle.x1, 0), min(obstacle.x2, w)
+        if x2 <= x1:
+            continue
+        for y in range(max(obstacle.y1, 0), min(obstacle.y2, h)):
+            active_cells[x1 + w * y : x2 + w * y] = bytes(x2 - x1)
+    maze = bytearray(b"\x0f") * n
+    walls = array("i" if 2 * n < 2**31 else "q", range(2 * n))
+    random.shuffle(walls)
+    parents = array("i" if n < 2**31 else "q", range(n))
+    ranks = bytearray(n)
+    for wall in walls:
+        u = wall >> 1
+        if wall & 1:
+            v = u + w
+            if v >= n:
+                continue
+        else:
+            v = u + 1
+            if v % w == 0:
+                continue
+        if not (active_cells[u] and active_cells[v]):
+            continue
+        # path halving instead of recursion, the trees stay shallow with ranks
+        a = u
+        while parents[a] != a:
+            parents[a] = parents[parents[a]]
+            a = parents[a]
+        b = v
+        while parents[b] != b:
+            parents[b] = parents[parents[b]]
+            b = parents[b]
+        if a == b:
+            continue
+        if ranks[a] < ranks[b]:
+            parents[a] = b
+        elif ranks[a] > ranks[b]:
+            parents[b] = a
+        else:
+            parents[a] = b
+            ranks[b] += 1
+        if wall & 1:
+            maze[u] &= ~2
+            maze[v] &= ~8
+        else:
+            maze[u] &= ~1
+            maze[v] &= ~4
+    return maze
+
+
+def render(maze: Iterable[int], w: int, h: int) -> str:
+    cells = list(maze)
+    return "\n".join(
+        "".join("╬╣╦╗╠║╔╥╩╝═╡╚╨╞?"[cells[x + y * w]] for x in range(w))
+        for y in reversed(range(h))
+    )
+
+
+def distance_field(
+    maze: Sequence[int], w: int, start: int = 0, goal: int = -1
+) -> array[int]:
+    # breadth-first search straight over the wall bits, -1 marks unreachable
+    # cells; the queue is a preallocated array since every cell enters it once
+    n = len(maze)
+    dists = array("i", [-1]) * n
+    queue = array("i", [0]) * n
+    queue[0] = start
+    dists[start] = 0
+    head, tail = 0, 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        if u == goal:
+            break
+        walls = maze[u]
+        d = dists[u] + 1
+        # unrolled, a loop over the four directions is about 30% slower
+        if not walls & 1 and dists[u + 1] < 0:
+            dists[u + 1] = d
+            queue[tail] = u + 1
+            tail += 1
+        if not walls & 2 and dists[u + w] < 0:
+            dists[u + w] = d
+            queue[tail] = u + w
+            tail += 1
+        if not walls & 4 and dists[u - 1] < 0:
+            dists[u - 1] = d
+            queue[tail] = u - 1
+            tail += 1
+        if not walls & 8 and dists[u - w] < 0:
+            dists[u - w] = d
+            queue[tail] = u - w
+            tail += 1
+    return dists
+
+
+def solve(maze: Sequence[int], w: int, start: int = 0, goal: int = -1) -> list[int]:
+    # the field is computed from the goal and the path walks downhill from start
+    goal %= len(maze)
+    dists = distance_field(maze, w, goal, start)
+    if dists[start] < 0:
+        return []
+    path = [start]
+    u = start
+    while u != goal:
+        walls = maze[u]
+        d = dists[u] - 1
+        for passage, v in (
+            (not walls & 1, u + 1),
+            (not walls & 2, u + w),
+            (not walls & 4, u - 1),
+            (not walls & 8, u - w),
+        ):
+            if passage and dists[v] == d:
+                u = v
+                break
+        path.append(u)
+    return path
+
+
+def main() -> None:
+    from sys import argv
+    from time import monotonic as time_now
+    import tracemalloc
+
+    w, h = 10, 10
+    obstacles = [Obstacle(0, 0, 2, 2), Obstacle(3, 3, 10, 6)]
+    print(render(generate(w, h, obstacles), w, h))
+    print()
+    print(render(generate_packed(w, h, obstacles), w, h))
+
+    sizes = list(map(int, argv[1:])) or [100, 300, 1000, 2000]
+    for size in sizes:
+        print(f"  {size} x {size}")
+        for f in [generate, generate_packed]:
+            if f is generate and size > 1000:
+                continue
+            t0 = time_now()
+            maze = f(size, size)
+            t1 = time_now()
+            # the peak is measured in a second run, tracing slows everything down
+            tracemalloc.start()
+            f(size, size)
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            print(f"dt={t1 - t0:.3f} peak={peak:.1f} MiB {f.__name__}")
+
+        t0 = time_now()
+        dists = distance_field(maze, size)
+        t1 = time_now()
+        path = solve(maze, size)
+        t2 = time_now()
+        # a perfect maze is a spanning tree: every cell is reachable
+        assert -1 not in dists and len(path) == dists[-1] + 1
+        print(f"dt={t1 - t0:.3f} distance_field, longest distance {max(dists)}")
+        print(f"dt={t2 - t1:.3f} solve, path of {len(path)} cells")
+
+
+if __name__ == "__main__":
+    main()
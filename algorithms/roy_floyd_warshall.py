@@ -1,6 +1,12 @@
+from array import array
+from collections.abc import Iterable, Iterator
 from typing import Any, Callable
-from math import inf
+from math import inf, isclose
 from itertools import product
+from multiprocessing import Barrier, Process, cpu_count
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier as BarrierType
 
 
 def roy_floyd_warshall_list2d_backend[T](
@@ -80,13 +86,134 @@ def roy_floyd_warshall_intkeys_flat(graph: dict[int, dict[int, float]]) -> list[
     return dists
 
 
+def roy_floyd_warshall_intkeys_flat_with_next_hops(
+    graph: dict[int, dict[int, float]],
+) -> tuple[list[float], array[int]]:
+    n = len(graph)
+    dists = [graph[u].get(v, inf) if u != v else 0 for u in range(n) for v in range(n)]
+    # next_hops[u * n + v] is the vertex after u on the shortest path to v
+    next_hops = array(
+        "i", [v if dists[u * n + v] < inf else -1 for u in range(n) for v in range(n)]
+    )
+    for t, u, v in product(range(n), repeat=3):
+        dist = dists[u * n + t] + dists[t * n + v]
+        if dist < dists[u * n + v]:
+            dists[u * n + v] = dist
+            next_hops[u * n + v] = next_hops[u * n + t]
+    return dists, next_hops
+
+
+def iter_path(next_hops: array[int], n: int, u: int, v: int) -> Iterator[int]:
+    if next_hops[u * n + v] < 0:
+        return
+    yield u
+    while u != v:
+        u = next_hops[u * n + v]
+        yield u
+
+
+def decrease_edge_flat(
+    dists: list[float], n: int, a: int, b: int, weight: float
+) -> None:
+    if weight >= dists[a * n + b]:
+        return
+    to_a = [dists[u * n + a] for u in range(n)]
+    from_b = dists[b * n : (b + 1) * n]
+    for u in range(n):
+        via = to_a[u] + weight
+        # d(u, v) <= d(u, b) + d(b, v), so the new edge is useless for this row
+        if via >= dists[u * n + b]:
+            continue
+        u_row = dists[u * n : (u + 1) * n]
+        dists[u * n : (u + 1) * n] = [
+            min(old, via + dist) for old, dist in zip(u_row, from_b)
+        ]
+
+
+def decrease_edges_flat(
+    dists: list[float], n: int, edges: Iterable[tuple[int, int, float]]
+) -> None:
+    for a, b, weight in edges:
+        decrease_edge_flat(dists, n, a, b, weight)
+
+
+def _roy_floyd_warshall_rows(
+    shm_name: str, n: int, start: int, stop: int, barrier: BarrierType
+) -> None:
+    shm = SharedMemory(shm_name)
+    dists = shm.buf.cast("d")
+    try:
+        for t in range(n):
+            # row t does not change while t is the pivot, so one barrier is enough
+            t_row = dists[t * n : (t + 1) * n].tolist()
+            for u in range(start, stop):
+                u_to_t = dists[u * n + t]
+                if u == t or u_to_t == inf:
+                    continue
+                u_row = dists[u * n : (u + 1) * n].tolist()
+                dists[u * n : (u + 1) * n] = array(
+                    "d", [min(a, u_to_t + b) for a, b in zip(u_row, t_row)]
+                )
+            barrier.wait()
+    finally:
+        dists.release()
+        shm.close()
+
+
+def roy_floyd_warshall_intkeys_flat_parallel(
+    graph: dict[int, dict[int, float]], processes: int | None = None
+) -> list[float]:
+    n = len(graph)
+    processes = min(processes or cpu_count(), n) or 1
+    shm = SharedMemory(create=True, size=max(1, n * n) * 8)
+    try:
+        dists = shm.buf.cast("d")
+        dists[: n * n] = array(
+            "d",
+            [graph[u].get(v, inf) if u != v else 0 for u in range(n) for v in range(n)],
+        )
+        barrier = Barrier(processes)
+        bounds = [n * i // processes for i in range(processes + 1)]
+        workers = [
+            Process(
+                target=_roy_floyd_warshall_rows,
+                args=(shm.name, n, start, stop, barrier),
+            )
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+        for worker in workers:
+            worker.start()
+        # a dead worker would leave the others waiting at the barrier forever,
+        # and it may have died holding the barrier lock, so they are terminated
+        pending = {worker.sentinel: worker for worker in workers}
+        while pending:
+            for sentinel in wait(list(pending)):
+                worker = pending.pop(sentinel)
+                worker.join()
+                if worker.exitcode != 0:
+                    for other in pending.values():
+                        other.terminate()
+        exitcodes = [worker.exitcode for worker in workers]
+        if any(exitcodes):
+            dists.release()
+            raise RuntimeError(f"workers failed with exit codes {exitcodes}")
+        result = dists[: n * n].tolist()
+        dists.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+
 IMPLEMENTATIONS: list[Callable[[dict[int, dict[int, float]]], Any]] = [
     roy_floyd_warshall_intkeys,
     roy_floyd_warshall_intkeys_dict,
     roy_floyd_warshall_list2d_backend,
     roy_floyd_warshall_listkey_backend,
     roy_floyd_warshall_intkeys_flat,
+    roy_floyd_warshall_intkeys_flat_with_next_hops,
     roy_floyd_warshall_in_dicts,
+    roy_floyd_warshall_intkeys_flat_parallel,
 ]
 
 
@@ -107,6 +234,41 @@ def main() -> None:
             dt = t1 - t0
             print(f"{dt=:.3f} {f.__name__}")
 
+    n = 200
+    print(f"  decreasing 10 edges, n = {n}")
+    graph = {
+        u: {v: randint(1, n**2) / n**2 for v in range(n) if randint(1, n) >= n**0.5}
+        for u in range(n)
+    }
+    dists = roy_floyd_warshall_intkeys_flat(graph)
+    edges = [(randint(0, n - 1), randint(0, n - 1), 1 / n**2) for _ in range(10)]
+    t0 = time_now()
+    decrease_edges_flat(dists, n, edges)
+    t1 = time_now()
+    for a, b, weight in edges:
+        graph[a][b] = weight
+    # the sums are added in a different order, so they may differ in the last bits
+    expected = roy_floyd_warshall_intkeys_flat(graph)
+    assert all(map(isclose, dists, expected))
+    t2 = time_now()
+    print(f"dt={t1 - t0:.3f} decrease_edges_flat")
+    print(f"dt={t2 - t1:.3f} roy_floyd_warshall_intkeys_flat")
+
+    n = 600
+    print(f"  speedup of roy_floyd_warshall_intkeys_flat_parallel, n = {n}")
+    graph = {
+        u: {v: randint(1, n**2) / n**2 for v in range(n) if randint(1, n) >= n**0.5}
+        for u in range(n)
+    }
+    single_core_dt = 0.0
+    for processes in sorted({1, 2, 4, cpu_count()}):
+        t0 = time_now()
+        roy_floyd_warshall_intkeys_flat_parallel(graph, processes)
+        t1 = time_now()
+        dt = t1 - t0
+        single_core_dt = single_core_dt or dt
+        print(f"{dt=:.3f} {processes=} speedup={single_core_dt / dt:.2f}")
+
 
 if __name__ == "__main__":
     main()
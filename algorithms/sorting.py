@@ -1,3 +1,15 @@
+from array import array as Array
+from bisect import bisect_right
+from collections import Counter
+from heapq import merge
+from io import BytesIO
+import heapq
+from itertools import accumulate, chain, repeat
+from multiprocessing import Pool, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+import os
+import pickle
 import random
 from time import monotonic as time
 from typing import Any, Callable
@@ -25,35 +37,512 @@ def gitalev_sort(array: list[Any]) -> None:
             i += 1
 
 
-def quicksort(array: list[Any], left: int = 0, right: int = ~0) -> None:
-    left %= len(array)
-    right %= len(array)
-    if right - left < 2:
-        array[left : right + 1] = list(sorted(array[left : right + 1]))
-        return
+def partition(array: list[Any], left: int, right: int) -> int:
+    # Lomuto partition around array[left], returns the final pivot position
     pivot, i = array[left], left
     for j in range(i + 1, right + 1):
         if array[j] <= pivot:
             i += 1
             array[i], array[j] = array[j], array[i]
     array[left], array[i] = array[i], array[left]
+    return i
+
+
+def quicksort(array: list[Any], left: int = 0, right: int = ~0) -> None:
+    left %= len(array)
+    right %= len(array)
+    if right - left < 2:
+        array[left : right + 1] = list(sorted(array[left : right + 1]))
+        return
+    i = partition(array, left, right)
     if i > left:
         quicksort(array, left, i - 1)
     if right > i:
         quicksort(array, i + 1, right)
 
 
+def median_of_three(array: list[Any], left: int, right: int) -> None:
+    # moves the median of the first, middle and last elements to array[left]
+    middle = (left + right) // 2
+    a, b, c = array[left], array[middle], array[right]
+    if a <= b <= c or c <= b <= a:
+        array[left], array[middle] = b, a
+    elif a <= c <= b or b <= c <= a:
+        array[left], array[right] = c, a
+
+
+def heapsort(array: list[Any], left: int = 0, right: int = ~0) -> None:
+    right %= len(array) or 1
+
+    def sift_down(root: int, end: int) -> None:
+        while (child := 2 * root + 1) < end:
+            if child + 1 < end and array[left + child] < array[left + child + 1]:
+                child += 1
+            if array[left + root] >= array[left + child]:
+                return
+            array[left + root], array[left + child] = (
+                array[left + child],
+                array[left + root],
+            )
+            root = child
+
+    n = right - left + 1
+    for root in reversed(range(n // 2)):
+        sift_down(root, n)
+    for end in reversed(range(1, n)):
+        array[left], array[left + end] = array[left + end], array[left]
+        sift_down(0, end)
+
+
+def insertion_sort(array: list[Any], left: int, right: int) -> None:
+    for i in range(left + 1, right + 1):
+        x, j = array[i], i
+        while j > left and array[j - 1] > x:
+            array[j] = array[j - 1]
+            j -= 1
+        array[j] = x
+
+
+def introsort(array: list[Any]) -> None:
+    # iterate on the bigger part and recurse into the smaller one, so the
+    # stack depth is O(log n) and the depth limit bounds the total work
+    def sort(left: int, right: int, depth: int) -> None:
+        while right - left > 16:
+            if depth == 0:
+                heapsort(array, left, right)
+                return
+            depth -= 1
+            median_of_three(array, left, right)
+            i = partition(array, left, right)
+            if i - left < right - i:
+                sort(left, i - 1, depth)
+                left = i + 1
+            else:
+                sort(i + 1, right, depth)
+                right = i - 1
+        insertion_sort(array, left, right)
+
+    sort(0, len(array) - 1, 2 * len(array).bit_length())
+
+
+def select_kth(array: list[Any], k: int) -> Any:
+    # reorders array so that array[k] is in its sorted position, smaller
+    # elements go before it and the others after it
+    if not 0 <= k < len(array):
+        raise IndexError(f"index {k} out of range")
+    left, right = 0, len(array) - 1
+    depth = 2 * len(array).bit_length()
+    while right - left > 16:
+        if depth == 0:
+            heapsort(array, left, right)
+            return array[k]
+        depth -= 1
+        median_of_three(array, left, right)
+        i = partition(array, left, right)
+        if i == k:
+            return array[k]
+        elif i < k:
+            left = i + 1
+        else:
+            right = i - 1
+    insertion_sort(array, left, right)
+    return array[k]
+
+
+def partial_sort(array: list[Any], k: int) -> None:
+    # the k smallest elements go to array[:k] in sorted order
+    k = min(k, len(array))
+    if k <= 0:
+        return
+    select_kth(array, k - 1)
+    array[:k] = sorted(array[:k])
+
+
+def nsmallest(array: list[Any], k: int) -> list[Any]:
+    # for a small k a bounded heap of k elements beats selecting in a copy
+    if k * 16 < len(array):
+        return heapq.nsmallest(k, array)
+    copy = array[:]
+    partial_sort(copy, k)
+    return copy[: max(k, 0)]
+
+
+def counting_sort(array: list[int]) -> None:
+    # Counter counts in C and only the k distinct values are sorted, so this is
+    # O(n + k log k) for any range of values
+    counts = Counter(array)
+    if len(counts) * 8 < len(array):
+        array[:] = chain.from_iterable(repeat(x, counts[x]) for x in sorted(counts))
+    else:
+        array.sort()
+
+
+def radix_sort_lsd(array: list[int], bits: int = 16) -> None:
+    if not array:
+        return
+    low = min(array)
+    shift_limit = (max(array) - low).bit_length()
+    mask = (1 << bits) - 1
+    keys = [x - low for x in array] if low else array[:]
+    for shift in range(0, shift_limit, bits):
+        buckets: list[list[int]] = [[] for _ in range(mask + 1)]
+        for x in keys:
+            buckets[x >> shift & mask].append(x)
+        keys = list(chain.from_iterable(buckets))
+    array[:] = [x + low for x in keys] if low else keys
+
+
+def radix_sort_msd(array: list[bytes], depth: int = 0) -> None:
+    # an explicit stack, a long common prefix would hit the recursion limit;
+    # buckets are pushed in reverse so they are popped and written in order
+    result: list[bytes] = []
+    stack = [(array[:], depth)]
+    while stack:
+        items, depth = stack.pop()
+        if len(items) <= 64:
+            result.extend(sorted(items))
+            continue
+        # strings ending at this depth go before every other bucket
+        buckets: list[list[bytes]] = [[] for _ in range(256)]
+        for s in items:
+            if len(s) > depth:
+                buckets[s[depth]].append(s)
+            else:
+                result.append(s)
+        stack.extend((bucket, depth + 1) for bucket in reversed(buckets) if bucket)
+    array[:] = result
+
+
+def _line_ranges(path: str, chunk_size: int) -> list[tuple[int, int]]:
+    # split a file into byte ranges of about chunk_size ending at newlines
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _sort_run(
+    path: str,
+    start: int,
+    end: int,
+    key: Callable[[bytes], Any] | None,
+    directory: str,
+) -> str:
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    # splitlines would also split at \r, but merge reads the runs line by line
+    lines = BytesIO(data).readlines()
+    del data
+    lines.sort(key=key)
+    with NamedTemporaryFile("wb", dir=directory, delete=False) as run:
+        run.writelines(lines)
+    return run.name
+
+
+def _merge_runs(
+    runs: list[str], output: str, key: Callable[[bytes], Any] | None
+) -> None:
+    files = [open(run, "rb") for run in runs]
+    try:
+        with open(output, "wb") as out:
+            out.writelines(merge(*files, key=key))
+    finally:
+        for file in files:
+            file.close()
+        for run in runs:
+            os.remove(run)
+
+
+def external_sort(
+    input_path: str,
+    output_path: str,
+    memory_budget: int = 2**28,
+    key: Callable[[bytes], Any] | None = None,
+    processes: int | None = None,
+    merge_width: int = 64,
+) -> None:
+    # a sorted list of short lines takes a few times more memory than the
+    # file itself, and every worker holds one chunk at a time
+    processes = processes or cpu_count()
+    if processes != 1 and not _picklable(key):
+        # lambdas and local functions can not be sent to the workers
+        processes = 1
+    chunk_size = max(1, memory_budget // (4 * processes))
+    ranges = _line_ranges(input_path, chunk_size)
+    with TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as tmp:
+        tasks = [(input_path, start, end, key, tmp) for start, end in ranges]
+        if processes == 1:
+            runs = [_sort_run(*task) for task in tasks]
+        else:
+            with Pool(processes) as pool:
+                runs = pool.starmap(_sort_run, tasks)
+        # merge at most merge_width runs at once to stay below the open files limit
+        generation = 0
+        while len(runs) > merge_width:
+            generation += 1
+            merged = []
+            for i in range(0, len(runs), merge_width):
+                merged.append(os.path.join(tmp, f"merged-{generation}-{i}"))
+                _merge_runs(runs[i : i + merge_width], merged[-1], key)
+            runs = merged
+        _merge_runs(runs, output_path, key)
+
+
+def compact_keys(keys: list[Any]) -> Array[Any] | list[Any]:
+    # ints fitting in 64 bits and floats are stored unboxed
+    try:
+        return Array("q", keys)
+    except (TypeError, OverflowError):
+        pass
+    if all(type(key) is float for key in keys):
+        return Array("d", keys)
+    return keys
+
+
+def argsort(
+    array: list[Any], key: Callable[[Any], Any] | None = None
+) -> Array[int]:
+    keys = compact_keys(list(map(key, array)) if key else array)
+    return Array("q", sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def apply_permutation(array: list[Any], order: Array[int] | list[int]) -> None:
+    # array[i] = array[order[i]] for every i, following cycles in place
+    done = bytearray(len(array))
+    for start in range(len(array)):
+        if done[start]:
+            continue
+        first, i = array[start], start
+        while True:
+            done[i] = True
+            j = order[i]
+            if j == start:
+                array[i] = first
+                break
+            array[i] = array[j]
+            i = j
+
+
+def sort_by_key(array: list[Any], key: Callable[[Any], Any]) -> None:
+    apply_permutation(array, argsort(array, key))
+
+
+_shared_memory: list[SharedMemory] = []
+_shared_arrays: list[memoryview] = []
+
+
+def _init_sample_sort_worker(names: list[str], typecode: str) -> None:
+    for name in names:
+        _shared_memory.append(SharedMemory(name))
+        _shared_arrays.append(_shared_memory[-1].buf.cast(typecode))
+
+
+def _partition_block(start: int, end: int, splitters: list[Any]) -> list[int]:
+    # regroups the block in place by bucket and returns the bucket sizes
+    data = _shared_arrays[0]
+    buckets: list[list[Any]] = [[] for _ in range(len(splitters) + 1)]
+    for x in data[start:end].tolist():
+        buckets[bisect_right(splitters, x)].append(x)
+    data[start:end] = Array(data.format, chain.from_iterable(buckets))
+    return [len(bucket) for bucket in buckets]
+
+
+def _sort_bucket(segments: list[tuple[int, int]], out_start: int) -> None:
+    data, out = _shared_arrays
+    values = [x for start, end in segments for x in data[start:end].tolist()]
+    values.sort()
+    out[out_start : out_start + len(values)] = Array(out.format, values)
+
+
+def sample_sort(
+    array: list[Any],
+    processes: int | None = None,
+    typecode: str = "q",
+    oversampling: int = 64,
+) -> None:
+    processes = processes or cpu_count()
+    n = len(array)
+    if n < 2:
+        return
+    sample = sorted(random.choices(array, k=processes * oversampling))
+    splitters = sample[oversampling::oversampling][: processes - 1]
+    itemsize = Array(typecode).itemsize
+    shared = [SharedMemory(create=True, size=n * itemsize) for _ in range(2)]
+    try:
+        # the segments may be rounded up to a whole page, as on macOS
+        shared[0].buf[: n * itemsize] = Array(typecode, array).tobytes()
+        names = [shm.name for shm in shared]
+        bounds = [n * i // processes for i in range(processes + 1)]
+        blocks = list(zip(bounds, bounds[1:]))
+        with Pool(processes, _init_sample_sort_worker, (names, typecode)) as pool:
+            counts = pool.starmap(
+                _partition_block, [(start, end, splitters) for start, end in blocks]
+            )
+            # bucket j of block i starts after the smaller buckets of block i
+            block_offsets = [
+                list(accumulate(block_counts, initial=start))
+                for (start, _), block_counts in zip(blocks, counts)
+            ]
+            bucket_sizes = [sum(column) for column in zip(*counts)]
+            bucket_starts = list(accumulate(bucket_sizes, initial=0))
+            tasks = []
+            for j, out_start in enumerate(bucket_starts[:-1]):
+                segments = [(offsets[j], offsets[j + 1]) for offsets in block_offsets]
+                tasks.append((segments, out_start))
+            pool.starmap(_sort_bucket, tasks)
+        out = shared[1].buf.cast(typecode)
+        array[:] = out[:n].tolist()
+        out.release()
+    finally:
+        for shm in shared:
+            shm.close()
+            shm.unlink()
+
+
+def builtin_sort(array: list[Any]) -> None:
+    array.sort()
+
+
 SORTING_METHODS: dict[str, Callable[[list[int]], None]] = {
     "quicksort": quicksort,
     "simple": simplest_sort,
     "Gitalev": gitalev_sort,
+    "introsort": introsort,
+    "heapsort": heapsort,
+    "counting": counting_sort,
+    "radix LSD": radix_sort_lsd,
+    "list.sort": builtin_sort,
+}
+FAST_SORTING_METHODS: dict[str, Callable[[list[int]], None]] = {
+    "introsort": introsort,
+    "counting": counting_sort,
+    "radix LSD": radix_sort_lsd,
+    "list.sort": builtin_sort,
+}
+BYTES_SORTING_METHODS: dict[str, Callable[[list[bytes]], None]] = {
+    "introsort": introsort,
+    "radix MSD": radix_sort_msd,
+    "list.sort": builtin_sort,
 }
-n = 10**3 * 5
-for name, sort in SORTING_METHODS.items():
-    array = [x for x in range(1, 1 + n)]
-    random.shuffle(array)
-    t0 = time()
-    sort(array)
-    t1 = time()
-    print(f"{name:>9}: ", t1 - t0)
-    assert is_sorted(array)
+
+
+def main() -> None:
+    n = 10**3 * 5
+    for name, sort in SORTING_METHODS.items():
+        array = [x for x in range(1, 1 + n)]
+        random.shuffle(array)
+        t0 = time()
+        sort(array)
+        t1 = time()
+        print(f"{name:>9}: ", t1 - t0)
+        assert is_sorted(array)
+
+    n = 10**6
+    inputs: dict[str, Callable[[], list[int]]] = {
+        "permutation": lambda: random.sample(range(n), n),
+        "sorted": lambda: list(range(n)),
+        "range(256)": lambda: [random.randrange(256) for _ in range(n)],
+        "int32": lambda: [random.getrandbits(32) for _ in range(n)],
+    }
+    for input_name, generate in inputs.items():
+        print(f"  n = {n}, {input_name}")
+        for name, sort in FAST_SORTING_METHODS.items():
+            array = generate()
+            t0 = time()
+            sort(array)
+            t1 = time()
+            print(f"{name:>9}: ", t1 - t0)
+            assert is_sorted(array)
+
+    print(f"  n = {n}, random bytes")
+    for name, sort in BYTES_SORTING_METHODS.items():
+        array = [random.randbytes(random.randint(0, 16)) for _ in range(n)]
+        t0 = time()
+        sort(array)
+        t1 = time()
+        print(f"{name:>9}: ", t1 - t0)
+        assert is_sorted(array)
+
+    print(f"  n = {n}, sample sort scaling")
+    numbers = [random.getrandbits(62) for _ in range(n)]
+    single_core_dt = 0.0
+    for processes in sorted({1, 2, 4, cpu_count()}):
+        array = numbers[:]
+        t0 = time()
+        sample_sort(array, processes)
+        t1 = time()
+        single_core_dt = single_core_dt or t1 - t0
+        speedup = single_core_dt / (t1 - t0)
+        print(f"{processes:>9}: ", t1 - t0, f"{speedup=:.2f}")
+        assert is_sorted(array)
+
+    numbers = [random.getrandbits(62) for _ in range(n)]
+    for k in [10, 1000, n // 2]:
+        print(f"  n = {n}, {k} smallest")
+        for name, select in {
+            "sorted": lambda array: sorted(array)[:k],
+            "heapq": lambda array: heapq.nsmallest(k, array),
+            "select": lambda array: select_kth(array, k - 1),
+            "partial": lambda array: partial_sort(array, k),
+            "nsmallest": lambda array: nsmallest(array, k),
+        }.items():
+            array = numbers[:]
+            t0 = time()
+            select(array)
+            t1 = time()
+            print(f"{name:>9}: ", t1 - t0)
+
+    print(f"  n = {n}, records sorted by an expensive key")
+    records = [(random.random(), str(random.getrandbits(64))) for _ in range(n)]
+    for name, sort in {
+        "list.sort": lambda array: array.sort(key=lambda r: int(r[1]) % 1000),
+        "argsort": lambda array: sort_by_key(array, lambda r: int(r[1]) % 1000),
+    }.items():
+        array = records[:]
+        t0 = time()
+        sort(array)
+        t1 = time()
+        print(f"{name:>9}: ", t1 - t0)
+        assert is_sorted([int(r[1]) % 1000 for r in array])
+
+    print(f"  n = {n}, lines in a file")
+    with TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "input.txt")
+        output_path = os.path.join(directory, "output.txt")
+        with open(input_path, "wb") as file:
+            file.writelines(b"%d\n" % random.getrandbits(64) for _ in range(n))
+        size = os.path.getsize(input_path)
+        t0 = time()
+        with open(input_path, "rb") as file:
+            lines = sorted(file)
+        t1 = time()
+        print(f"{'sorted':>9}: ", t1 - t0)
+        for budget in [size * 4, size // 4, size // 64]:
+            t0 = time()
+            external_sort(input_path, output_path, memory_budget=budget)
+            t1 = time()
+            print(f"{'external':>9}: ", t1 - t0, f"{budget=}")
+            with open(output_path, "rb") as file:
+                assert file.readlines() == lines
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain, repeat
+from typing import Any, Self
+import mmap
+import struct
+
+MAGIC = b"SUFX"
+# magic, typecode, is the text bytes, text length, encoded text size
+HEADER = struct.Struct("<4sc?2xQQ")
+
+
+def suffix_array(text: str | bytes) -> array[int]:
+    # prefix doubling: suffixes are sorted by their first k symbols, then by
+    # pairs of ranks of the halves, which gives the first 2k symbols
+    n = len(text)
+    typecode = "i" if n < 2**31 else "q"
+    symbols = list(text) if isinstance(text, bytes) else list(map(ord, text))
+    order = sorted(range(n), key=symbols.__getitem__)
+    rank = [0] * n
+    for prev, i in zip(order, order[1:]):
+        rank[i] = rank[prev] + (symbols[i] != symbols[prev])
+    k = 1
+    while n and rank[order[-1]] < n - 1:
+        shifted = chain(rank[k:], repeat(-1, min(k, n)))
+        keys = [r * (n + 1) + s + 1 for r, s in zip(rank, shifted)]
+        order.sort(key=keys.__getitem__)
+        for prev, i in zip(order, order[1:]):
+            rank[i] = rank[prev] + (keys[i] != keys[prev])
+        k *= 2
+    return array(typecode, order)
+
+
+def lcp_array(text: str | bytes, sa: array[int] | memoryview) -> array[int]:
+    # Kasai: lcp[j] is the common prefix of suffixes sa[j - 1] and sa[j]
+    n = len(text)
+    rank = [0] * n
+    for j, i in enumerate(sa):
+        rank[i] = j
+    lcp = array(sa.typecode if isinstance(sa, array) else sa.format, [0]) * n
+    h = 0
+    for i in range(n):
+        if rank[i] == 0:
+            h = 0
+            continue
+        j = sa[rank[i] - 1]
+        while i + h < n and j + h < n and text[i + h] == text[j + h]:
+            h += 1
+        lcp[rank[i]] = h
+        if h:
+            h -= 1
+    return lcp
+
+
+def _padding(text_size: int) -> int:
+    return -(HEADER.size + text_size) % 8
+
+
+class SuffixIndex:
+    text: str | bytes
+    sa: array[int] | memoryview
+    lcp: array[int] | memoryview
+
+    def __init__(
+        self,
+        text: str | bytes,
+        sa: array[int] | memoryview | None = None,
+        lcp: array[int] | memoryview | None = None,
+        mapped: mmap.mmap | None = None,
+    ):
+        self.text = text
+        self.sa = suffix_array(text) if sa is None else sa
+        self.lcp = lcp_array(text, self.sa) if lcp is None else lcp
+        self._mmap = mapped
+
+    def _range(self, needle: str | bytes) -> tuple[int, int]:
+        # binary search over sorted suffixes compares O(m) symbols per step
+        m = len(needle)
+        text = self.text
+
+        def prefix(i: int) -> Any:
+            return text[i : i + m]
+
+        return (
+            bisect_left(self.sa, needle, key=prefix),
+            bisect_right(self.sa, needle, key=prefix),
+        )
+
+    def count(self, needle: str | bytes) -> int:
+        start, stop = self._range(needle)
+        return stop - start
+
+    def find_all(self, needle: str | bytes) -> list[int]:
+        start, stop = self._range(needle)
+        return sorted(self.sa[start:stop])
+
+    def save(self, path: str) -> None:
+        is_bytes = isinstance(self.text, bytes)
+        text = self.text if isinstance(self.text, bytes) else self.text.encode()
+        typecode = self.sa.typecode if isinstance(self.sa, array) else self.sa.format
+        header = HEADER.pack(
+            MAGIC, typecode.encode(), is_bytes, len(self.text), len(text)
+        )
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(text)
+            # pad the text so that the arrays are aligned to 8 bytes
+            file.write(b"\0" * _padding(len(text)))
+            file.write(self.sa)
+            file.write(self.lcp)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, typecode, is_bytes, n, text_size = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a suffix index file")
+        raw = mapped[HEADER.size : HEADER.size + text_size]
+        text: str | bytes = raw if is_bytes else raw.decode()
+        offset = HEADER.size + text_size + _padding(text_size)
+        view = memoryview(mapped)[offset:].cast(typecode.decode())
+        return cls(text, view[:n], view[n : 2 * n], mapped)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            for view in (self.sa, self.lcp):
+                if isinstance(view, memoryview):
+                    view.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def main() -> None:
+    from os import path
+    from random import choice, randint
+    from tempfile import TemporaryDirectory
+    from time import monotonic as time_now
+
+    for n in [10**4, 10**5, 10**6]:
+        print(f"  n = {n}")
+        text = "".join(choice("acgt") for _ in range(n))
+        needles = [text[i : i + 12] for i in (randint(0, n - 12) for _ in range(1000))]
+        t0 = time_now()
+        index = SuffixIndex(text)
+        t1 = time_now()
+        found = [index.find_all(needle) for needle in needles]
+        t2 = time_now()
+        print(f"dt={t1 - t0:.3f} build, dt={t2 - t1:.3f} find_all x {len(needles)}")
+
+        t0 = time_now()
+        for needle, positions in zip(needles, found):
+            i, expected = text.find(needle), []
+            while i != -1:
+                expected.append(i)
+                i = text.find(needle, i + 1)
+            assert positions == expected
+        t1 = time_now()
+        print(f"dt={t1 - t0:.3f} str.find x {len(needles)}")
+
+        with TemporaryDirectory() as directory:
+            filename = path.join(directory, "index.bin")
+            index.save(filename)
+            t0 = time_now()
+            with SuffixIndex.load(filename) as loaded:
+                t1 = time_now()
+                assert [loaded.count(needle) for needle in needles] == list(
+                    map(len, found)
+                )
+            print(f"dt={t1 - t0:.3f} load")
+
+
+if __name__ == "__main__":
+    main()
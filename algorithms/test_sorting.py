@@ -0,0 +1,40 @@
+import sorting
+import pytest
+
+
+@pytest.fixture
+def unsorted_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"b\rz\na\nc\r\n")
+    return path
+
+
+def test_external_sort_keeps_carriage_returns_inside_lines(unsorted_file, tmp_path):
+    output = tmp_path / "output.txt"
+    sorting.external_sort(str(unsorted_file), str(output), processes=1)
+    assert output.read_bytes() == b"a\nb\rz\nc\r\n"
+
+
+def test_external_sort_with_lambda_key(unsorted_file, tmp_path):
+    output = tmp_path / "output.txt"
+    sorting.external_sort(
+        str(unsorted_file), str(output), key=lambda line: -line[0], processes=2
+    )
+    assert output.read_bytes() == b"c\r\nb\rz\na\n"
+
+
+@pytest.mark.parametrize("k", [-1, 0, 1, 3, 40, 100])
+@pytest.mark.parametrize("n", [0, 1, 40])
+def test_nsmallest_and_partial_sort_clamp_k(n, k):
+    array = list(range(n, 0, -1))
+    assert sorting.nsmallest(array, k) == sorted(array)[: max(k, 0)]
+    sorting.partial_sort(array, k)
+    assert array[: max(k, 0)] == sorted(array)[: max(k, 0)]
+
+
+def test_select_kth_rejects_indexes_out_of_range():
+    array = list(range(40, 0, -1))
+    assert sorting.select_kth(array[:], 5) == 6
+    for k in [-1, 40]:
+        with pytest.raises(IndexError):
+            sorting.select_kth(array, k)
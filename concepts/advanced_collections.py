@@ -1,12 +1,68 @@
 # bins - idea for package name if I ever put this thing on pypy
-from collections.abc import Hashable, MutableSequence, MutableSet, Sequence, Set
+from array import array
+from collections.abc import (
+    Collection,
+    Hashable,
+    MutableSequence,
+    MutableSet,
+    Sequence,
+    Set,
+)
+from itertools import chain, filterfalse
+from numbers import Number
 from typing import Any, Iterable, Iterator, Self, TypeVar, overload
 from random import randint
 
 T = TypeVar("T")
 
 
-class SequentialSet(Sequence[T], Set[T]):
+class IndexedSetOperations(Set[T]):
+    # |, & and - for sets keeping their elements in values and their positions in
+    # indexes, the Set mixins would call __contains__ for every single element
+    __slots__ = ()
+    values: list[T]
+    indexes: dict[T, int]
+
+    @staticmethod
+    def _keys(other: Iterable[Any]) -> Collection[Any]:
+        # the indexes dicts are the fastest containers to test membership against
+        if isinstance(other, IndexedSetOperations):
+            return other.indexes
+        if isinstance(other, Set):
+            return other
+        return dict.fromkeys(other)
+
+    def __or__(self, other: Iterable[T]) -> Self:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        # dict.fromkeys in __init__ drops the duplicates without calling Python code
+        return self.__class__(chain(self.values, other))
+
+    def __and__(self, other: Iterable[Any]) -> Self:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        # the result keeps the order of the left side, sorting the matches back
+        # into it only pays off when the right side is at least 4 times smaller
+        keys = self._keys(other)
+        if len(self.values) <= 4 * len(keys):
+            return self.__class__(filter(keys.__contains__, self.values))
+        indexes = self.indexes
+        matches = filter(indexes.__contains__, keys)
+        return self.__class__(sorted(matches, key=indexes.__getitem__))
+
+    def __sub__(self, other: Iterable[Any]) -> Self:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        keys = self._keys(other)
+        if len(self.values) <= len(keys):
+            return self.__class__(filterfalse(keys.__contains__, self.values))
+        elements = dict.fromkeys(self.values)
+        for element in keys:
+            elements.pop(element, None)
+        return self.__class__(elements)
+
+
+class SequentialSet(Sequence[T], IndexedSetOperations[T]):
     __slots__ = ("indexes", "values")
 
     def __init__(self, iterable: Iterable[T] = ()):
@@ -222,6 +278,105 @@ class MutableOrHashableSequentialSet(
             self.indexes[filler] = i
 
 
+FREE = -1
+PERTURB_SHIFT = 5
+
+
+class CompactSequentialSet(Sequence[int], Set[int]):
+    # SequentialSet for 64-bit ints without boxing: values live in array("q") and
+    # indexes is an open-addressing table of positions in values, probed the same
+    # way as in ordered_sets/raymond_hettinger_dict_based_sets.py
+    __slots__ = ("values", "table")
+
+    def __init__(self, iterable: Iterable[int] = ()):
+        self.values = values = array("q", iterable)
+        size = 8
+        while size * 2 < len(values) * 3:
+            size *= 2
+        self.table = table = self._make_table(size, len(values))
+        n = 0
+        for value in values:
+            slot = self._slot(value)
+            if table[slot] == FREE:
+                table[slot] = n
+                values[n] = value
+                n += 1
+        del values[n:]
+
+    @staticmethod
+    def _make_table(size: int, n: int) -> array[int]:
+        typecode = "b" if n < 2**7 else "h" if n < 2**15 else "i" if n < 2**31 else "q"
+        return array(typecode, [FREE]) * size
+
+    def _slot(self, value: int) -> int:
+        table, values = self.table, self.values
+        mask = len(table) - 1
+        perturb = value & 0xFFFFFFFFFFFFFFFF
+        i = perturb & mask
+        while (index := table[i]) != FREE and values[index] != value:
+            perturb >>= PERTURB_SHIFT
+            i = (5 * i + perturb + 1) & mask
+        return i
+
+    @staticmethod
+    def _as_int(element: Any) -> int | None:
+        # 1.0, 1 + 0j, Decimal(1) and Fraction(1) are equal to 1, as in SequentialSet
+        if isinstance(element, complex) and not element.imag:
+            element = element.real
+        if isinstance(element, int):
+            value = int(element)
+        elif isinstance(element, Number):
+            try:
+                value = int(element)  # type: ignore
+            except (TypeError, ValueError, OverflowError):
+                return None
+            if value != element:
+                return None
+        else:
+            return None
+        return value if -(2**63) <= value < 2**63 else None
+
+    def __contains__(self, element: Any) -> bool:
+        value = self._as_int(element)
+        return value is not None and self.table[self._slot(value)] != FREE
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self.values.tolist()})"
+
+    def __str__(self) -> str:
+        return "{" + ", ".join(map(repr, self.values)) + "}"
+
+    @overload
+    def __getitem__(self, i: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> Self:
+        ...
+
+    def __getitem__(self, i: int | slice) -> int | Self:
+        if isinstance(i, int):
+            return self.values[i]
+        return self.__class__(self.values[i])
+
+    def index(self, value: int, start: int = 0, stop: int | None = None) -> int:
+        element = self._as_int(value)
+        if element is None:
+            return -1
+        real_stop = stop if stop is not None else 2**63
+        i = self.table[self._slot(element)]
+        return i if i != FREE and start <= i < real_stop else -1
+
+    def freeze(self) -> "HashableSequentialSet[int]":
+        return HashableSequentialSet(self.values)
+
+
 class MutableHashableOrderedSetWithDuringIterationMutationAllowed(
     MutableSequence[T], MutableSet[T]
 ):
@@ -503,7 +658,7 @@ class FrozenOrderedSet(OrderedSet[T], Hashable):
         return hash(tuple(self.elements))
 
 
-class IndexedSet(Sequence[T], Set[T]):
+class IndexedSet(Sequence[T], IndexedSetOperations[T]):
     __slots__ = ("indexes", "values")
 
     def __init__(self, iterable: Iterable[T] = ()):
@@ -870,3 +1025,44 @@ class StorageSet(MutableSequence[T], MutableSet[T]):
         frozen_set.values, frozen_set.indexes = self.values, self.indexes
         self.values, self.indexes = [], {}
         return frozen_set
+
+
+def main() -> None:
+    from functools import partial
+    from sys import getsizeof
+    from time import monotonic as time_now
+    from timeit import repeat
+
+    for n in [10**4, 10**5, 10**6]:
+        print(f"  n = {n}")
+        numbers = [randint(0, 2**40) for _ in range(n)]
+        for cls in [SequentialSet, CompactSequentialSet]:
+            t0 = time_now()
+            s = cls(numbers)
+            t1 = time_now()
+            assert all(x in s for x in numbers)
+            t2 = time_now()
+            if isinstance(s, CompactSequentialSet):
+                size = getsizeof(s.values) + getsizeof(s.table)
+            else:
+                size = getsizeof(s.values) + getsizeof(s.indexes)
+                size += sum(map(getsizeof, s.values))
+            print(f"dt={t1 - t0:.3f} + {t2 - t1:.3f} {size:>10} bytes {cls.__name__}")
+
+    operators = {"|": Set.__or__, "&": Set.__and__, "-": Set.__sub__}
+    for n, m in [(10**5, 10**5), (10**5, 10**2), (10**2, 10**5)]:
+        print(f"  {n} and {m} elements")
+        for cls in [SequentialSet, IndexedSet, MutableIndexedSet]:
+            a = cls(randint(0, 2 * n) for _ in range(n))
+            b = cls(randint(0, 2 * m) for _ in range(m))
+            for symbol, mixin in operators.items():
+                method = getattr(cls, mixin.__name__)
+                assert method(a, b) == mixin(a, b)
+                native = min(repeat(partial(method, a, b), number=1, repeat=5))
+                abc = min(repeat(partial(mixin, a, b), number=1, repeat=5))
+                name = cls.__name__
+                print(f"dt={native:.4f} vs {abc:.4f} ABC, a {symbol} b {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+from collections.abc import Set
+
+import advanced_collections
+import pytest
+
+CLASSES = [
+    advanced_collections.SequentialSet,
+    advanced_collections.IndexedSet,
+    advanced_collections.MutableIndexedSet,
+]
+
+
+@pytest.mark.parametrize("cls", CLASSES)
+def test_intersection_keeps_the_order_of_the_left_operand(cls):
+    assert list(cls([5, 1, 4, 2]) & cls([2, 4, 5, 3])) == [5, 4, 2]
+    assert list(cls(range(10, 0, -1)) & cls([1, 9])) == [9, 1]
+
+
+@pytest.mark.parametrize("cls", CLASSES)
+@pytest.mark.parametrize("other", [[3, 0, 7, 3], {1, 2, 3}, range(2, 40, 3)])
+def test_set_operations_match_set_mixins(cls, other):
+    s = cls(range(0, 30, 2))
+    for operator in [Set.__or__, Set.__and__, Set.__sub__]:
+        result = getattr(s, operator.__name__)(other)
+        assert type(result) is cls
+        assert result == operator(s, other)
+
+
+@pytest.mark.parametrize("cls", CLASSES)
+def test_union_and_difference_keep_the_order(cls):
+    assert list(cls([3, 1, 2]) | cls([4, 1, 0])) == [3, 1, 2, 4, 0]
+    assert list(cls([3, 1, 2, 5]) - cls([1])) == [3, 2, 5]